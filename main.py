@@ -1,9 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from src.engine.verification import verify_query_with_ledger
+from fastapi.responses import JSONResponse
+from src.engine.verification_with_ledger import verify_query_with_ledger
+from src.engine.hedging import hedge_stats
+from src.engine.admission import ADMISSION, AdmissionRejected
+from src.engine.accounting import KEY_BUDGETS, TokenAccount
+from src.api.schemas import CETIResponse, RefusalDiagnostics
+from src.engine.jobs import JobManager, JobQueueFull
+from src.engine.convergence import load_embedder
+from src.config.settings import ALLOWED_RISK_TIERS, JOB_LONG_POLL_MAX_SEC
 import os
 
-app = FastAPI(title="CETI Consensus Engine")
+job_manager = JobManager()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await load_embedder()
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+
+app = FastAPI(title="CETI Consensus Engine", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,17 +33,104 @@ app.add_middleware(
 
 API_MASTER_KEY = os.getenv("CETI_MASTER_KEY", "default-master-key")
 
-@app.post("/verify")
-async def verify(request: Request):
-    body = await request.json()
+def authorize(request: Request):
     user_key = request.headers.get("Authorization", "")
     if user_key.startswith("Bearer "):
         user_key = user_key[7:]
     if user_key != API_MASTER_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
+    return KEY_BUDGETS.key_id(user_key)
+
+def budget_refusal(query, risk_tier):
+    return CETIResponse(
+        authorization="DENIED",
+        response_content="Authorization denied — token budget exhausted.",
+        scope=None,
+        refusal_diagnostics=RefusalDiagnostics(
+            failure_type="budget_exhausted",
+            details="API key token budget exhausted for the current window.",
+            requirements_for_certification="Wait for the budget window to roll over."
+        ),
+        certification_id=None,
+        meta={"query": query, "risk_tier": risk_tier}
+    )
+
+def capacity_refusal(query, risk_tier, reason, retry_after, requirements):
+    refusal = CETIResponse(
+        authorization="DENIED",
+        response_content="Authorization denied — verification capacity exhausted.",
+        scope=None,
+        refusal_diagnostics=RefusalDiagnostics(
+            failure_type="instability",
+            details=reason,
+            requirements_for_certification=requirements
+        ),
+        certification_id=None,
+        meta={"query": query, "risk_tier": risk_tier, "retry_after": retry_after}
+    )
+    return JSONResponse(
+        status_code=503,
+        content=refusal.model_dump(),
+        headers={"Retry-After": str(retry_after)}
+    )
+
+@app.post("/verify")
+async def verify(request: Request):
+    body = await request.json()
+    key_id = authorize(request)
     query = body.get("query")
     risk_tier = body.get("risk_tier", "MEDIUM")
+    token_budget = body.get("token_budget")
     if not query:
         raise HTTPException(status_code=400, detail="Missing 'query' in request body")
-    result = await verify_query_with_ledger(query=query, risk_tier=risk_tier)
+    if risk_tier not in ALLOWED_RISK_TIERS:
+        raise HTTPException(status_code=400, detail=f"Invalid 'risk_tier': {risk_tier}")
+    if token_budget is not None and (not isinstance(token_budget, int) or isinstance(token_budget, bool) or token_budget <= 0):
+        raise HTTPException(status_code=400, detail="'token_budget' must be a positive integer")
+    if request.query_params.get("async", "false").lower() in ("1", "true", "yes"):
+        try:
+            job = await job_manager.submit(query=query, risk_tier=risk_tier, token_budget=token_budget, key_id=key_id)
+        except JobQueueFull as e:
+            return capacity_refusal(
+                query, risk_tier, e.reason, e.retry_after, f"Retry after {e.retry_after} seconds."
+            )
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": job["id"], "status": job["status"], "status_url": f"/jobs/{job['id']}"}
+        )
+    reservation = KEY_BUDGETS.reserve(key_id, token_budget)
+    if reservation.budget == 0:
+        reservation.settle(0)
+        return JSONResponse(status_code=429, content=budget_refusal(query, risk_tier).model_dump())
+    account = TokenAccount(reservation.budget)
+    try:
+        async with ADMISSION.slot(risk_tier) as deadline:
+            result = await verify_query_with_ledger(
+                query=query, risk_tier=risk_tier, deadline=deadline, account=account
+            )
+    except AdmissionRejected as e:
+        return capacity_refusal(
+            query, risk_tier, e.reason, e.retry_after,
+            f"Retry after {e.retry_after} seconds or submit with ?async=true."
+        )
+    finally:
+        reservation.settle(account.total_tokens)
     return result
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, request: Request, wait: float = 0):
+    authorize(request)
+    job = await job_manager.wait(job_id, timeout=min(max(wait, 0), JOB_LONG_POLL_MAX_SEC))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job
+
+@app.get("/metrics/hedging")
+async def hedging_metrics(request: Request):
+    authorize(request)
+    return hedge_stats()
+
+@app.get("/metrics/admission")
+async def admission_metrics(request: Request):
+    authorize(request)
+    return ADMISSION.stats()
@@ -17,6 +17,7 @@ class RefusalDiagnostics(BaseModel):
         "gaming_suspicion",
         "missing_evidence",
         "instability",
+        "budget_exhausted",
         "other"
     ]
     details: str = Field(..., description="Explanation of what failed")
@@ -1,10 +1,14 @@
 import os
-from typing import List, Literal
+from typing import Dict, List, Literal, TypedDict
 
 GENERATOR_MODEL = os.getenv(
     "GENERATOR_MODEL",
     "groq/llama3-groq-70b-8192-tool-use-preview"
 )
+GENERATOR_FALLBACK_MODEL = os.getenv(
+    "GENERATOR_FALLBACK_MODEL",
+    "deepseek/deepseek-chat"
+)
 CRITIC_MODEL = os.getenv(
     "CRITIC_MODEL",
     "groq/llama3-groq-70b-8192-tool-use-preview"
@@ -17,6 +21,8 @@ JUDGE_MODELS = os.getenv(
 
 MAX_ROUNDS_DEFAULT = int(os.getenv("MAX_ROUNDS", "5"))
 SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.92"))
+LEXICAL_SIMILARITY_THRESHOLD = float(os.getenv("LEXICAL_SIMILARITY_THRESHOLD", "0.8"))
+CONVERGENCE_USE_EMBEDDINGS = os.getenv("CONVERGENCE_USE_EMBEDDINGS", "true").lower() in ("1", "true", "yes")
 CHROMA_PATH = os.getenv("CHROMA_PATH", "./chroma_db")
 
 ALLOWED_RISK_TIERS: tuple[Literal["LOW","MEDIUM","HIGH","CRITICAL"], ...] = (
@@ -27,18 +33,127 @@ MIN_ADVERSARIAL_ROUNDS = int(os.getenv("MIN_ADVERSARIAL_ROUNDS", "3"))
 MIN_QUORUM_SIZE = int(os.getenv("MIN_QUORUM_SIZE", "3"))
 MIN_MECHANICAL_ORTHOGONALITY_WEIGHT = float(os.getenv("MIN_MECHANICAL_ORTHOGONALITY_WEIGHT", "0.4"))
 DRIFT_VARIANTS_COUNT = int(os.getenv("DRIFT_VARIANTS_COUNT", "8"))
+MIN_QUORUM_THRESHOLD = 2 / 3
+
+HEDGE_LATENCY_PERCENTILE = float(os.getenv("HEDGE_LATENCY_PERCENTILE", "0.95"))
+HEDGE_DEFAULT_DELAY_SEC = float(os.getenv("HEDGE_DEFAULT_DELAY_SEC", "8.0"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_LATENCY_WINDOW = int(os.getenv("HEDGE_LATENCY_WINDOW", "500"))
+HEDGE_BUDGET_PER_REQUEST = int(os.getenv("HEDGE_BUDGET_PER_REQUEST", "2"))
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "1000"))
+JOB_LONG_POLL_MAX_SEC = float(os.getenv("JOB_LONG_POLL_MAX_SEC", "30"))
+JOB_RETENTION_SEC = int(os.getenv("JOB_RETENTION_SEC", "604800"))
+JOB_SWEEP_INTERVAL_SEC = int(os.getenv("JOB_SWEEP_INTERVAL_SEC", "60"))
+JOB_JOURNAL_COMPACT_BYTES = int(os.getenv("JOB_JOURNAL_COMPACT_BYTES", str(16 * 1024 * 1024)))
+
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "32"))
+ADMISSION_MIN_CONCURRENCY = int(os.getenv("ADMISSION_MIN_CONCURRENCY", "4"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+ADMISSION_LATENCY_TOLERANCE = float(os.getenv("ADMISSION_LATENCY_TOLERANCE", "2.0"))
+
+REQUEST_TOKEN_BUDGET = int(os.getenv("REQUEST_TOKEN_BUDGET", "0"))
+API_KEY_TOKEN_BUDGET = int(os.getenv("API_KEY_TOKEN_BUDGET", "0"))
+API_KEY_BUDGET_WINDOW_SEC = int(os.getenv("API_KEY_BUDGET_WINDOW_SEC", "86400"))
+API_KEY_RESERVATION_TOKENS = int(os.getenv("API_KEY_RESERVATION_TOKENS", "20000"))
+
+
+class TierPlan(TypedDict):
+    """Execution plan applied by the engine for one risk tier (BRAIN.md, stronghold 5)."""
+
+    max_rounds: int
+    critic_panel_size: int
+    judge_models: List[str]
+    quorum_threshold: float  # strictly more than this fraction of judges must accept
+    retrieval_depth: int
+    deadline_sec: float
+
+
+def _tier_plan(
+    tier: str,
+    max_rounds: int,
+    critic_panel_size: int,
+    judge_count: int,
+    quorum_threshold: float,
+    retrieval_depth: int,
+    deadline_sec: float,
+) -> TierPlan:
+    judge_count = int(os.getenv(f"{tier}_JUDGE_COUNT", str(judge_count)))
+    return TierPlan(
+        max_rounds=int(os.getenv(f"{tier}_MAX_ROUNDS", str(max_rounds))),
+        critic_panel_size=int(os.getenv(f"{tier}_CRITIC_PANEL_SIZE", str(critic_panel_size))),
+        judge_models=JUDGE_MODELS[:judge_count],
+        quorum_threshold=float(os.getenv(f"{tier}_QUORUM_THRESHOLD", str(quorum_threshold))),
+        retrieval_depth=int(os.getenv(f"{tier}_RETRIEVAL_DEPTH", str(retrieval_depth))),
+        deadline_sec=float(os.getenv(f"{tier}_DEADLINE_SEC", str(deadline_sec))),
+    )
+
+
+RISK_TIER_PLANS: Dict[str, TierPlan] = {
+    "LOW": _tier_plan("LOW", 1, 1, 2, MIN_QUORUM_THRESHOLD, 3, 20),
+    "MEDIUM": _tier_plan("MEDIUM", 2, 1, 2, MIN_QUORUM_THRESHOLD, 5, 45),
+    "HIGH": _tier_plan("HIGH", MIN_ADVERSARIAL_ROUNDS, 2, len(JUDGE_MODELS), MIN_QUORUM_THRESHOLD, 8, 90),
+    "CRITICAL": _tier_plan("CRITICAL", MAX_ROUNDS_DEFAULT, 3, len(JUDGE_MODELS), MIN_QUORUM_THRESHOLD, 10, 180),
+}
+
+
+def required_accepts(plan: TierPlan) -> int:
+    return int(len(plan["judge_models"]) * plan["quorum_threshold"]) + 1
+
+
+def get_tier_plan(risk_tier: str) -> TierPlan:
+    if risk_tier not in RISK_TIER_PLANS:
+        raise ValueError(f"Invalid risk_tier: {risk_tier}")
+    return RISK_TIER_PLANS[risk_tier]
 
 SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 
+PROVIDER_API_KEYS = {
+    "groq": GROQ_API_KEY,
+    "deepseek": DEEPSEEK_API_KEY,
+}
+
+def provider_api_key(model: str):
+    return PROVIDER_API_KEYS.get(model.split("/", 1)[0])
+
 API_MASTER_KEY = os.getenv("CETI_MASTER_KEY", "default-master-key")
 
+def enforce_tier_plan_invariants():
+    if set(RISK_TIER_PLANS) != set(ALLOWED_RISK_TIERS):
+        raise AssertionError("RISK_TIER_PLANS must define every allowed risk tier")
+    previous = None
+    for tier in ALLOWED_RISK_TIERS:
+        plan = RISK_TIER_PLANS[tier]
+        if plan["max_rounds"] < 1 or plan["critic_panel_size"] < 1:
+            raise AssertionError(f"{tier} plan needs at least one round and one critic")
+        if len(plan["judge_models"]) < 2:
+            raise AssertionError(f"{tier} plan needs at least two judge models; no single judge may authorize")
+        if not MIN_QUORUM_THRESHOLD <= plan["quorum_threshold"] < 1.0:
+            raise AssertionError(f"{tier} quorum threshold must be within [2/3, 1)")
+        if plan["retrieval_depth"] < 1 or plan["deadline_sec"] <= 0:
+            raise AssertionError(f"{tier} plan needs positive retrieval depth and deadline")
+        if tier in ("HIGH", "CRITICAL"):
+            if plan["max_rounds"] < MIN_ADVERSARIAL_ROUNDS:
+                raise AssertionError(f"{tier} max_rounds must be >= MIN_ADVERSARIAL_ROUNDS")
+            if len(plan["judge_models"]) < MIN_QUORUM_SIZE:
+                raise AssertionError(f"{tier} judge roster must have >= MIN_QUORUM_SIZE models")
+        if previous is not None:
+            for key in ("max_rounds", "critic_panel_size", "quorum_threshold", "retrieval_depth"):
+                if plan[key] < previous[key]:
+                    raise AssertionError(f"{tier} {key} must not be weaker than lower tiers")
+            if len(plan["judge_models"]) < len(previous["judge_models"]):
+                raise AssertionError(f"{tier} judge roster must not be smaller than lower tiers")
+        previous = plan
+
 def enforce_invariants():
     if MAX_ROUNDS_DEFAULT < MIN_ADVERSARIAL_ROUNDS:
         raise AssertionError("MAX_ROUNDS must be >= MIN_ADVERSARIAL_ROUNDS")
     if len(JUDGE_MODELS) < MIN_QUORUM_SIZE:
         raise AssertionError("At least MIN_QUORUM_SIZE judge models required")
+    enforce_tier_plan_invariants()
     if MIN_MECHANICAL_ORTHOGONALITY_WEIGHT < 0.4:
         raise AssertionError("Mechanical orthogonality weight must be >= 0.4")
     if not SERPER_API_KEY:
@@ -47,6 +162,14 @@ def enforce_invariants():
         raise AssertionError("GROQ_API_KEY missing in environment")
     if not DEEPSEEK_API_KEY:
         raise AssertionError("DEEPSEEK_API_KEY missing in environment")
+    if GENERATOR_FALLBACK_MODEL == GENERATOR_MODEL:
+        raise AssertionError("GENERATOR_FALLBACK_MODEL must differ from GENERATOR_MODEL")
+    if not provider_api_key(GENERATOR_FALLBACK_MODEL):
+        raise AssertionError("GENERATOR_FALLBACK_MODEL provider has no configured API key")
+    if not 0 < HEDGE_LATENCY_PERCENTILE < 1:
+        raise AssertionError("HEDGE_LATENCY_PERCENTILE must be within (0, 1)")
+    if not 1 <= ADMISSION_MIN_CONCURRENCY <= ADMISSION_MAX_CONCURRENCY:
+        raise AssertionError("ADMISSION_MIN_CONCURRENCY must be within [1, ADMISSION_MAX_CONCURRENCY]")
     print("CETI invariants enforced successfully.")
 
 enforce_invariants()
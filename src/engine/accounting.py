@@ -0,0 +1,122 @@
+import hashlib
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from src.config.settings import (
+    REQUEST_TOKEN_BUDGET,
+    API_KEY_TOKEN_BUDGET,
+    API_KEY_BUDGET_WINDOW_SEC,
+    API_KEY_RESERVATION_TOKENS
+)
+
+
+def usage_of(response) -> Dict[str, int]:
+    if isinstance(response, dict):
+        usage = response.get("usage") or {}
+    else:
+        usage = getattr(response, "usage", None) or {}
+    if not isinstance(usage, dict):
+        usage = {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+            "completion_tokens": getattr(usage, "completion_tokens", 0),
+            "total_tokens": getattr(usage, "total_tokens", 0),
+        }
+    prompt = int(usage.get("prompt_tokens") or 0)
+    completion = int(usage.get("completion_tokens") or 0)
+    total = int(usage.get("total_tokens") or prompt + completion)
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": total}
+
+
+class TokenAccount:
+    """Per-request token usage by oracle stage, with an optional hard budget."""
+
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.oracle_calls = 0
+        self.by_stage: Dict[str, int] = {}
+
+    def add(self, stage: str, prompt_tokens: int, completion_tokens: int, total_tokens: Optional[int] = None) -> None:
+        total = prompt_tokens + completion_tokens if total_tokens is None else total_tokens
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.total_tokens += total
+        self.oracle_calls += 1
+        self.by_stage[stage] = self.by_stage.get(stage, 0) + total
+
+    def record(self, stage: str, response) -> None:
+        usage = usage_of(response)
+        self.add(stage, usage["prompt_tokens"], usage["completion_tokens"], usage["total_tokens"])
+
+    def exhausted(self) -> bool:
+        return self.budget is not None and self.total_tokens >= self.budget
+
+    def as_meta(self) -> Dict[str, Any]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "oracle_calls": self.oracle_calls,
+            "by_stage": dict(self.by_stage),
+            "budget": self.budget,
+        }
+
+
+class BudgetReservation:
+    """Tokens held against an API key for one request until its actual spend is known."""
+
+    def __init__(self, budget: Optional[int], entry: Optional[List] = None):
+        self.budget = budget
+        self.entry = entry
+
+    def settle(self, tokens: int) -> None:
+        if self.entry is not None:
+            self.entry[1] = tokens
+
+
+class KeyBudgets:
+    """Rolling-window token spend per API key (keys are stored hashed).
+
+    Requests reserve their budget up front and settle to actual usage when they
+    finish, so concurrent requests from one key cannot each see the full remainder.
+    An explicit token_budget (or REQUEST_TOKEN_BUDGET) is reserved as given, up to
+    what the key has left; otherwise API_KEY_RESERVATION_TOKENS is reserved.
+    """
+
+    def __init__(self, limit: int = API_KEY_TOKEN_BUDGET, window_sec: int = API_KEY_BUDGET_WINDOW_SEC):
+        self.limit = limit
+        self.window_sec = window_sec
+        self.spend: Dict[str, deque] = {}
+
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+    def _spent(self, key_id: str) -> int:
+        entries = self.spend.setdefault(key_id, deque())
+        cutoff = time.time() - self.window_sec
+        while entries and entries[0][0] < cutoff:
+            entries.popleft()
+        return sum(tokens for _, tokens in entries)
+
+    def remaining(self, key_id: str) -> Optional[int]:
+        if self.limit <= 0:
+            return None
+        return max(0, self.limit - self._spent(key_id))
+
+    def reserve(self, key_id: str, requested: Optional[int] = None) -> BudgetReservation:
+        explicit = requested if requested is not None else REQUEST_TOKEN_BUDGET or None
+        remaining = self.remaining(key_id)
+        if remaining is None:
+            return BudgetReservation(explicit)
+        # Without an explicit budget a request holds API_KEY_RESERVATION_TOKENS,
+        # not the whole remainder, so one key can still run requests concurrently.
+        budget = min(explicit if explicit is not None else API_KEY_RESERVATION_TOKENS, remaining)
+        entry = [time.time(), budget]
+        self.spend.setdefault(key_id, deque()).append(entry)
+        return BudgetReservation(budget, entry)
+
+
+KEY_BUDGETS = KeyBudgets()
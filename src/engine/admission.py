@@ -0,0 +1,180 @@
+import asyncio
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from src.config.settings import (
+    ADMISSION_MAX_CONCURRENCY,
+    ADMISSION_MIN_CONCURRENCY,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_LATENCY_TOLERANCE,
+    get_tier_plan
+)
+
+TIER_PRIORITY = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    def __init__(self, risk_tier: str, deadline: float, seq: int, sheddable: bool):
+        self.risk_tier = risk_tier
+        self.deadline = deadline
+        self.sheddable = sheddable
+        self.key: Tuple[int, float, int] = (-TIER_PRIORITY[risk_tier], deadline, seq)
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class AdmissionController:
+    """Concurrency gate in front of the engine with a bounded, tier-prioritized queue.
+
+    Waiters are served by risk tier, then earliest deadline. When the queue is
+    full the lowest-priority sheddable waiter is evicted, or the newcomer is
+    refused if it ranks lowest. The concurrency limit follows per-oracle-call
+    latency: it shrinks when recent calls run ADMISSION_LATENCY_TOLERANCE times
+    slower than the long-run average, and grows back while the queue is backed up.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = ADMISSION_MAX_CONCURRENCY,
+        min_concurrency: int = ADMISSION_MIN_CONCURRENCY,
+        max_queue: int = ADMISSION_MAX_QUEUE
+    ):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_queue = max_queue
+        self.limit = max_concurrency
+        self.active = 0
+        self.waiters: List[_Waiter] = []
+        self.service_time: Optional[float] = None
+        self.oracle_latency: Optional[float] = None
+        self.oracle_baseline: Optional[float] = None
+        self.counters = {"admitted": 0, "queued": 0, "shed": 0}
+        self._seq = itertools.count()
+
+    def _ewma(self, sample: float) -> None:
+        if self.service_time is None:
+            self.service_time = sample
+        else:
+            self.service_time = 0.8 * self.service_time + 0.2 * sample
+
+    def observe_oracle_latency(self, seconds: float) -> None:
+        if self.oracle_latency is None or self.oracle_baseline is None:
+            self.oracle_latency = self.oracle_baseline = seconds
+            return
+        self.oracle_latency = 0.8 * self.oracle_latency + 0.2 * seconds
+        self.oracle_baseline = 0.98 * self.oracle_baseline + 0.02 * seconds
+
+    def _oracle_saturated(self) -> bool:
+        if self.oracle_latency is None or self.oracle_baseline is None:
+            return False
+        return self.oracle_latency > ADMISSION_LATENCY_TOLERANCE * self.oracle_baseline
+
+    def retry_after(self) -> int:
+        if self.service_time is None:
+            return 1
+        return max(1, math.ceil(self.service_time * (len(self.waiters) + 1) / self.limit))
+
+    def _estimated_wait(self, key: Tuple[int, float, int]) -> float:
+        if self.service_time is None:
+            return 0.0
+        ahead = sum(1 for w in self.waiters if w.key < key)
+        return self.service_time * (ahead // self.limit + 1)
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.counters["shed"] += 1
+        return AdmissionRejected(reason, self.retry_after())
+
+    def _dispatch(self) -> None:
+        self.waiters.sort(key=lambda w: w.key)
+        while self.waiters and self.active < self.limit:
+            waiter = self.waiters.pop(0)
+            if waiter.future.done():
+                continue
+            self.active += 1
+            waiter.future.set_result(True)
+
+    async def acquire(self, risk_tier: str, sheddable: bool = True) -> float:
+        """Wait for a slot and return the absolute deadline the engine must honour.
+
+        Sheddable requests keep the deadline set on arrival, so queueing time
+        counts against their tier budget; non-sheddable ones start it on admission.
+        """
+        plan = get_tier_plan(risk_tier)
+        deadline = time.monotonic() + plan["deadline_sec"]
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            self.counters["admitted"] += 1
+            return deadline
+
+        waiter = _Waiter(risk_tier, deadline, next(self._seq), sheddable)
+        if sheddable:
+            if self._estimated_wait(waiter.key) > plan["deadline_sec"]:
+                raise self._reject(f"Estimated queue wait exceeds {risk_tier} deadline")
+            sheddable_waiters = [w for w in self.waiters if w.sheddable]
+            if len(sheddable_waiters) >= self.max_queue:
+                worst = max(sheddable_waiters, key=lambda w: w.key, default=None)
+                if worst is None or worst.key < waiter.key:
+                    raise self._reject(f"Admission queue full; {risk_tier} request shed")
+                self.waiters.remove(worst)
+                worst.future.set_exception(self._reject(f"Displaced by higher-priority traffic; {worst.risk_tier} request shed"))
+
+        self.waiters.append(waiter)
+        self.counters["queued"] += 1
+        try:
+            timeout = max(0.0, deadline - time.monotonic()) if sheddable else None
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+            if waiter.future.done() and not waiter.future.exception():
+                self.release(0.0)
+            raise self._reject(f"{risk_tier} deadline passed while queued")
+        except asyncio.CancelledError:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+            if waiter.future.done() and not waiter.future.exception():
+                self.release(0.0)
+            raise
+        self.counters["admitted"] += 1
+        return deadline if sheddable else time.monotonic() + plan["deadline_sec"]
+
+    def release(self, elapsed: float, completed: bool = False) -> None:
+        self.active -= 1
+        if completed:
+            self._ewma(elapsed)
+            if self._oracle_saturated():
+                self.limit = max(self.min_concurrency, int(self.limit * 0.9))
+            elif self.waiters and self.active + 1 >= self.limit:
+                self.limit = min(self.max_concurrency, self.limit + 1)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, risk_tier: str, sheddable: bool = True):
+        deadline = await self.acquire(risk_tier, sheddable=sheddable)
+        started = time.monotonic()
+        try:
+            yield deadline
+        finally:
+            self.release(time.monotonic() - started, completed=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "active": self.active,
+            "queue_depth": len(self.waiters),
+            "concurrency_limit": self.limit,
+            "service_time_sec": self.service_time,
+            "oracle_latency_sec": self.oracle_latency,
+            "oracle_baseline_sec": self.oracle_baseline,
+        }
+
+
+ADMISSION = AdmissionController()
@@ -0,0 +1,106 @@
+import asyncio
+import importlib
+import math
+import re
+from typing import Dict, List, Literal, Optional, Tuple
+from src.config.settings import (
+    SIMILARITY_THRESHOLD,
+    LEXICAL_SIMILARITY_THRESHOLD,
+    CONVERGENCE_USE_EMBEDDINGS
+)
+
+_embed = None
+_embeddings_available = CONVERGENCE_USE_EMBEDDINGS
+_embed_lock: Optional[asyncio.Lock] = None
+
+
+def _shingles(text: str) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def lexical_similarity(a: str, b: str) -> float:
+    sa, sb = _shingles(a), _shingles(b)
+    if not sa and not sb:
+        return 1.0
+    return len(sa & sb) / len(sa | sb)
+
+
+def _cosine(u: List[float], v: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(u, v))
+    norm = math.sqrt(sum(x * x for x in u)) * math.sqrt(sum(y * y for y in v))
+    return dot / norm if norm else 0.0
+
+
+async def load_embedder():
+    """Import the embedding model off the event loop; None if embeddings are unavailable.
+
+    Importing src.utils.embeddings builds the SentenceTransformer (and may
+    download it), so it runs in a worker thread, once.
+    """
+    global _embed, _embeddings_available, _embed_lock
+    if not _embeddings_available or _embed is not None:
+        return _embed
+    if _embed_lock is None:
+        _embed_lock = asyncio.Lock()
+    async with _embed_lock:
+        if _embed is None and _embeddings_available:
+            try:
+                module = await asyncio.to_thread(importlib.import_module, "src.utils.embeddings")
+                _embed = module.get_embedding
+            except Exception:
+                _embeddings_available = False
+    return _embed
+
+
+class ConvergenceDetector:
+    """Detects a stalled critic/defense loop that can only end in denial.
+
+    contradiction: the defense repeats the previous answer and the critic repeats its rejection.
+    instability: the defense flips back to the answer from two rounds earlier.
+
+    Similarity is embedding cosine against SIMILARITY_THRESHOLD, falling back to
+    lexical shingle overlap; each text is embedded at most once per request.
+    """
+
+    def __init__(self, first_answer: str):
+        self.answers: List[str] = [first_answer]
+        self.critiques: List[str] = []
+        self.vectors: Dict[str, List[float]] = {}
+
+    async def _vector(self, text: str) -> Optional[List[float]]:
+        global _embeddings_available
+        if text in self.vectors:
+            return self.vectors[text]
+        embed = await load_embedder()
+        if embed is None:
+            return None
+        try:
+            vector = await asyncio.to_thread(embed, text)
+        except Exception:
+            _embeddings_available = False
+            return None
+        self.vectors[text] = vector
+        return vector
+
+    async def is_similar(self, a: str, b: str) -> bool:
+        u = await self._vector(a)
+        v = await self._vector(b) if u is not None else None
+        if u is not None and v is not None:
+            return _cosine(u, v) >= SIMILARITY_THRESHOLD
+        return lexical_similarity(a, b) >= LEXICAL_SIMILARITY_THRESHOLD
+
+    async def observe(
+        self, critique: str, answer: str
+    ) -> Optional[Tuple[Literal["contradiction", "instability"], str]]:
+        self.critiques.append(critique)
+        self.answers.append(answer)
+        if len(self.critiques) >= 2 and await self.is_similar(self.answers[-1], self.answers[-2]):
+            if await self.is_similar(self.critiques[-1], self.critiques[-2]):
+                return "contradiction", "defense and critique unchanged between successive rounds"
+        if len(self.answers) >= 3 and await self.is_similar(self.answers[-1], self.answers[-3]):
+            if not await self.is_similar(self.answers[-1], self.answers[-2]):
+                return "instability", "defense oscillates between previously rejected answers"
+        return None
@@ -14,3 +14,8 @@ CRITIC_VARIANTS = [
 def select_critic_variant() -> str:
     index = int(time.time()) % len(CRITIC_VARIANTS)
     return CRITIC_VARIANTS[index]
+
+def select_critic_panel(size: int) -> list[str]:
+    start = int(time.time()) % len(CRITIC_VARIANTS)
+    size = min(size, len(CRITIC_VARIANTS))
+    return [CRITIC_VARIANTS[(start + i) % len(CRITIC_VARIANTS)] for i in range(size)]
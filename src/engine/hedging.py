@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from litellm import acompletion
+from src.engine.admission import ADMISSION
+from src.engine.accounting import TokenAccount
+from src.config.settings import (
+    GENERATOR_MODEL,
+    GENERATOR_FALLBACK_MODEL,
+    GROQ_API_KEY,
+    HEDGE_LATENCY_PERCENTILE,
+    HEDGE_DEFAULT_DELAY_SEC,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_LATENCY_WINDOW,
+    HEDGE_BUDGET_PER_REQUEST,
+    provider_api_key
+)
+
+
+class LatencyTracker:
+    """Rolling window of primary generator latencies."""
+
+    def __init__(self, window: int = HEDGE_LATENCY_WINDOW):
+        self.samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, p: float = HEDGE_LATENCY_PERCENTILE) -> float:
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY_SEC
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class HedgeBudget:
+    """Per-request allowance of backup generator calls."""
+
+    def __init__(self, limit: int = HEDGE_BUDGET_PER_REQUEST):
+        self.limit = limit
+        self.generator_calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def available(self) -> bool:
+        return self.hedges + self.failovers < self.limit
+
+    def as_meta(self) -> Dict[str, int]:
+        return {
+            "generator_calls": self.generator_calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+        }
+
+
+GENERATOR_LATENCY = LatencyTracker()
+HEDGE_TOTALS: Dict[str, int] = {"generator_calls": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0}
+
+
+def hedge_stats() -> Dict[str, Any]:
+    calls = HEDGE_TOTALS["generator_calls"]
+    hedges = HEDGE_TOTALS["hedges"]
+    return {
+        **HEDGE_TOTALS,
+        "hedge_rate": hedges / calls if calls else 0.0,
+        "hedge_win_rate": HEDGE_TOTALS["hedge_wins"] / hedges if hedges else 0.0,
+        "hedge_delay_sec": GENERATOR_LATENCY.percentile(),
+    }
+
+
+def _count(budget: HedgeBudget, key: str) -> None:
+    setattr(budget, key, getattr(budget, key) + 1)
+    HEDGE_TOTALS[key] += 1
+
+
+async def _primary(messages: List[Dict[str, str]], max_tokens: int):
+    started = time.monotonic()
+    try:
+        response = await acompletion(
+            model=GENERATOR_MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            api_key=GROQ_API_KEY
+        )
+    except asyncio.CancelledError:
+        # A primary that lost to the backup took at least this long; recording
+        # the censored sample lets the hedge delay follow a slowing primary.
+        GENERATOR_LATENCY.record(time.monotonic() - started)
+        raise
+    GENERATOR_LATENCY.record(time.monotonic() - started)
+    ADMISSION.observe_oracle_latency(time.monotonic() - started)
+    return response
+
+
+async def _backup(messages: List[Dict[str, str]], max_tokens: int):
+    started = time.monotonic()
+    response = await acompletion(
+        model=GENERATOR_FALLBACK_MODEL,
+        messages=messages,
+        max_tokens=max_tokens,
+        api_key=provider_api_key(GENERATOR_FALLBACK_MODEL)
+    )
+    ADMISSION.observe_oracle_latency(time.monotonic() - started)
+    return response
+
+
+def _charge_cancelled(account: Optional[TokenAccount], messages: List[Dict[str, str]], max_tokens: int) -> None:
+    if account is None:
+        return
+    # Usage of a cancelled call is never reported; charge a ~4 chars/token
+    # prompt estimate plus the full completion allowance as its upper bound.
+    prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+    account.add("generator:cancelled", prompt_tokens, max_tokens)
+
+
+async def hedged_completion(
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    budget: Optional[HedgeBudget] = None,
+    account: Optional[TokenAccount] = None
+):
+    """Call the generator, hedging to the fallback provider when the primary is slow or fails.
+
+    The backup fires once the primary exceeds the tracked latency percentile, or
+    immediately on a primary error; both count against the request's hedge budget.
+    The first successful response wins and the other call is cancelled and
+    charged to the account at its upper bound.
+    """
+    budget = budget or HedgeBudget()
+    _count(budget, "generator_calls")
+    primary = asyncio.create_task(_primary(messages, max_tokens))
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=GENERATOR_LATENCY.percentile())
+        if primary in done and primary.exception() is None:
+            return primary.result()
+        if not budget.available():
+            return await primary
+        _count(budget, "failovers" if primary in done else "hedges")
+        backup = asyncio.create_task(_backup(messages, max_tokens))
+        tasks.add(backup)
+        pending = set(tasks) - done
+        error: Optional[BaseException] = primary.exception() if primary in done else None
+        while pending:
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                if task.exception() is None:
+                    if task is backup and primary not in done:
+                        _count(budget, "hedge_wins")
+                    return task.result()
+                error = task.exception()
+        raise error or RuntimeError("generator produced no response")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+                _charge_cancelled(account, messages, max_tokens)
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import math
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from src.config.settings import (
+    JOB_WORKERS,
+    JOB_QUEUE_MAX,
+    JOB_RETENTION_SEC,
+    JOB_SWEEP_INTERVAL_SEC,
+    JOB_JOURNAL_COMPACT_BYTES
+)
+from src.engine.verification_with_ledger import verify_query_with_ledger
+from src.engine.admission import ADMISSION
+from src.engine.accounting import KEY_BUDGETS, TokenAccount
+
+JOBS_PATH = os.getenv("CETI_JOBS_PATH", "./jobs.jsonl")
+
+PENDING_STATUSES = ("queued", "running")
+
+
+class JobQueueFull(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class JobStore:
+    """Append-only JSONL job journal; the latest line per job id is its state.
+
+    Finished jobs past JOB_RETENTION_SEC are evicted every JOB_SWEEP_INTERVAL_SEC,
+    and the journal is rewritten in a worker thread once it outgrows
+    JOB_JOURNAL_COMPACT_BYTES; appends wait on the journal lock meanwhile.
+    """
+
+    def __init__(
+        self,
+        path: str = JOBS_PATH,
+        retention_sec: int = JOB_RETENTION_SEC,
+        compact_bytes: int = JOB_JOURNAL_COMPACT_BYTES
+    ):
+        self.path = path
+        self.retention_sec = retention_sec
+        self.compact_bytes = compact_bytes
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.journal_bytes = 0
+        self.compact_at = compact_bytes
+        self.last_sweep = 0.0
+        self.lock = asyncio.Lock()
+
+    async def load(self) -> List[Dict[str, Any]]:
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        job = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.jobs[job["id"]] = job
+        self._evict_expired()
+        await self._compact()
+        pending = [job for job in self.jobs.values() if job["status"] in PENDING_STATUSES]
+        return sorted(pending, key=lambda job: job["created_at"])
+
+    def _evict_expired(self) -> None:
+        cutoff = int(time.time()) - self.retention_sec
+        self.jobs = {
+            job_id: job for job_id, job in self.jobs.items()
+            if job["status"] in PENDING_STATUSES or job["updated_at"] >= cutoff
+        }
+        self.last_sweep = time.monotonic()
+
+    def _rewrite(self, jobs: List[Dict[str, Any]]) -> int:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for job in jobs:
+                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        return os.path.getsize(self.path)
+
+    async def _compact(self) -> None:
+        snapshot = [dict(job) for job in self.jobs.values()]
+        self.journal_bytes = await asyncio.to_thread(self._rewrite, snapshot)
+        # Leave headroom so a journal of mostly live jobs is not rewritten on every save.
+        self.compact_at = max(self.compact_bytes, 2 * self.journal_bytes)
+
+    async def save(self, job: Dict[str, Any]) -> None:
+        job["updated_at"] = int(time.time())
+        self.jobs[job["id"]] = job
+        line = json.dumps(job, ensure_ascii=False) + "\n"
+        async with self.lock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except Exception as e:
+                raise RuntimeError(f"Failed to write job to journal: {e}")
+            self.journal_bytes += len(line.encode())
+            if time.monotonic() - self.last_sweep >= JOB_SWEEP_INTERVAL_SEC:
+                self._evict_expired()
+            if self.journal_bytes > self.compact_at:
+                self._evict_expired()
+                await self._compact()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.jobs.get(job_id)
+
+
+class JobManager:
+    """Bounded in-process worker pool running verifications from the job journal."""
+
+    def __init__(self, store: Optional[JobStore] = None, workers: int = JOB_WORKERS):
+        self.store = store or JobStore()
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.events: Dict[str, asyncio.Event] = {}
+        self.tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        for job in await self.store.load():
+            job["status"] = "queued"
+            await self.store.save(job)
+            self._enqueue(job["id"])
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def retry_after(self) -> int:
+        service_time = ADMISSION.service_time or 1.0
+        return max(1, math.ceil(service_time * self.queue.qsize() / self.workers))
+
+    def _enqueue(self, job_id: str) -> None:
+        self.events[job_id] = asyncio.Event()
+        self.queue.put_nowait(job_id)
+
+    async def submit(
+        self,
+        query: str,
+        risk_tier: str,
+        token_budget: Optional[int] = None,
+        key_id: str = ""
+    ) -> Dict[str, Any]:
+        if self.queue.qsize() >= JOB_QUEUE_MAX:
+            raise JobQueueFull(f"Job queue is full ({JOB_QUEUE_MAX} pending)", self.retry_after())
+        now = int(time.time())
+        job: Dict[str, Any] = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "query": query,
+            "risk_tier": risk_tier,
+            "token_budget": token_budget,
+            "key_id": key_id,
+            "created_at": now,
+            "updated_at": now,
+            "result": None,
+            "error": None,
+        }
+        await self.store.save(job)
+        self._enqueue(job["id"])
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        event = self.events.get(job_id)
+        if event is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.get(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self.queue.get()
+            job = self.store.get(job_id)
+            try:
+                if job is None or job["status"] not in PENDING_STATUSES:
+                    continue
+                job["status"] = "running"
+                await self.store.save(job)
+                reservation = KEY_BUDGETS.reserve(job.get("key_id", ""), job.get("token_budget"))
+                account = TokenAccount(reservation.budget)
+                try:
+                    async with ADMISSION.slot(job["risk_tier"], sheddable=False) as deadline:
+                        result = await verify_query_with_ledger(
+                            query=job["query"], risk_tier=job["risk_tier"], deadline=deadline, account=account
+                        )
+                    job["status"] = "done"
+                    job["result"] = result.model_dump()
+                except Exception as e:
+                    job["status"] = "failed"
+                    job["error"] = str(e)
+                finally:
+                    reservation.settle(account.total_tokens)
+                await self.store.save(job)
+            finally:
+                event = self.events.pop(job_id, None)
+                if event is not None:
+                    event.set()
+                self.queue.task_done()
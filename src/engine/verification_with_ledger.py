@@ -1,23 +1,27 @@
 import os
 import hashlib
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import asyncio
 import requests
 from litellm import acompletion
 from src.config.settings import (
-    GENERATOR_MODEL,
     CRITIC_MODEL,
-    JUDGE_MODELS,
-    MAX_ROUNDS_DEFAULT,
     SERPER_API_KEY,
     GROQ_API_KEY,
-    DEEPSEEK_API_KEY
+    DEEPSEEK_API_KEY,
+    TierPlan,
+    get_tier_plan,
+    required_accepts
 )
 from src.api.schemas import CETIResponse, RefusalDiagnostics, AuthorizationScope
 from src.engine.guards import is_gaming_attempt
 from src.ledger.vault import record_verdict
-from src.engine.critics import select_critic_variant
+from src.engine.critics import select_critic_panel
+from src.engine.hedging import HedgeBudget, hedged_completion
+from src.engine.admission import ADMISSION
+from src.engine.accounting import TokenAccount
+from src.engine.convergence import ConvergenceDetector
 
 def extract_content(response):
     if isinstance(response, dict):
@@ -41,9 +45,47 @@ def browse_web(query, num_results=5):
     except Exception as e:
         return f"Web search failed: {str(e)}"
 
-async def quorum_vote(final_answer, query, risk_tier):
-    accepts = 0
-    for judge_model in JUDGE_MODELS:
+def remaining_time(deadline: float) -> float:
+    return max(0.0, deadline - time.monotonic())
+
+async def oracle_completion(**kwargs):
+    started = time.monotonic()
+    response = await acompletion(**kwargs)
+    ADMISSION.observe_oracle_latency(time.monotonic() - started)
+    return response
+
+async def critic_round(critic_panel, query, current_answer, deadline, account: TokenAccount):
+    async def run_critic(critic_system):
+        critic_prompt = f"""
+{critic_system}
+
+Original query: {query}
+
+Proposed answer:
+{current_answer}
+
+VERDICT: ACCEPT only if the answer is PERFECT — zero flaws, ambiguities, risks, or gaps.
+Otherwise VERDICT: REJECT followed by exhaustive destruction of every issue.
+"""
+        try:
+            critic_response = await asyncio.wait_for(
+                oracle_completion(
+                    model=CRITIC_MODEL,
+                    messages=[{"role":"system","content":critic_prompt}],
+                    max_tokens=400,
+                    api_key=GROQ_API_KEY
+                ),
+                timeout=remaining_time(deadline)
+            )
+            account.record("critic", critic_response)
+            return extract_content(critic_response)
+        except Exception:
+            return "CRITIC FAILURE - VERDICT: REJECT"
+
+    return await asyncio.gather(*(run_critic(c) for c in critic_panel))
+
+async def quorum_vote(final_answer, query, risk_tier, plan: TierPlan, deadline: float, account: TokenAccount):
+    async def run_judge(judge_model):
         judge_prompt = f"""
 You are an impartial Arbiter. Evaluate this final answer for the query:
 
@@ -55,46 +97,78 @@ Final answer:
 Is this answer flawless for {risk_tier} risk? VERDICT: ACCEPT or REJECT.
 """
         try:
-            judge_response = await acompletion(
-                model=judge_model,
-                messages=[{"role":"system","content":judge_prompt}],
-                max_tokens=100,
-                api_key=GROQ_API_KEY
+            judge_response = await asyncio.wait_for(
+                oracle_completion(
+                    model=judge_model,
+                    messages=[{"role":"system","content":judge_prompt}],
+                    max_tokens=100,
+                    api_key=GROQ_API_KEY
+                ),
+                timeout=remaining_time(deadline)
             )
-            verdict = extract_content(judge_response)
-            if "VERDICT: ACCEPT" in verdict.upper():
-                accepts += 1
+            account.record(f"judge:{judge_model}", judge_response)
+            return "VERDICT: ACCEPT" in extract_content(judge_response).upper()
         except Exception:
-            continue
-    required_accepts = len(JUDGE_MODELS)*2//3 + 1
-    return accepts >= required_accepts
+            return False
+
+    judges = plan["judge_models"]
+    votes = await asyncio.gather(*(run_judge(j) for j in judges))
+    return sum(votes) >= required_accepts(plan)
 
-async def verify_query_with_ledger(query: str, risk_tier="MEDIUM") -> CETIResponse:
-    gaming, reason = is_gaming_attempt(query)
-    if gaming:
+async def verify_query_with_ledger(
+    query: str,
+    risk_tier="MEDIUM",
+    token_budget: Optional[int] = None,
+    deadline: Optional[float] = None,
+    account: Optional[TokenAccount] = None
+) -> CETIResponse:
+    plan = get_tier_plan(risk_tier)
+    if deadline is None:
+        deadline = time.monotonic() + plan["deadline_sec"]
+    if is_gaming_attempt(query):
         return CETIResponse(
             authorization="DENIED",
             response_content="Query rejected — potential governance gaming detected.",
             scope=None,
             refusal_diagnostics=RefusalDiagnostics(
                 failure_type="gaming_suspicion",
-                details=reason,
+                details="Input pattern indicates adversarial manipulation",
                 requirements_for_certification="Rephrase without meta-instructions or governance references."
             ),
             certification_id=None,
             meta={"query": query}
         )
 
-    web_context = browse_web(query)
+    hedge_budget = HedgeBudget()
+    account = account or TokenAccount(token_budget)
+    if account.exhausted():
+        return CETIResponse(
+            authorization="DENIED",
+            response_content="Authorization denied — token budget exhausted.",
+            scope=None,
+            refusal_diagnostics=RefusalDiagnostics(
+                failure_type="budget_exhausted",
+                details=f"Token budget of {account.budget} leaves no room for verification.",
+                requirements_for_certification="Raise the token budget or wait for the API key budget window to roll over."
+            ),
+            certification_id=None,
+            meta={"query": query, "risk_tier": risk_tier, "tokens": account.as_meta()}
+        )
+    try:
+        web_context = await asyncio.wait_for(
+            asyncio.to_thread(browse_web, query, plan["retrieval_depth"]),
+            timeout=remaining_time(deadline)
+        )
+    except asyncio.TimeoutError:
+        web_context = "Web search failed: tier deadline exceeded"
     gen_messages = [{"role":"user","content":f"{web_context}\nProvide accurate, complete, and supported answer: {query}"}]
 
     try:
-        gen_response = await acompletion(
-            model=GENERATOR_MODEL,
-            messages=gen_messages,
-            max_tokens=500,
-            api_key=GROQ_API_KEY
+        gen_response = await asyncio.wait_for(
+            hedged_completion(gen_messages, max_tokens=500, budget=hedge_budget, account=account),
+            timeout=remaining_time(deadline)
         )
+        account.record("generator", gen_response)
         current_answer = extract_content(gen_response)
     except Exception as e:
         return CETIResponse(
@@ -107,44 +181,44 @@ async def verify_query_with_ledger(query: str, risk_tier="MEDIUM") -> CETIRespon
                 requirements_for_certification="Retry later."
             ),
             certification_id=None,
-            meta={"query": query}
+            meta={"query": query, "risk_tier": risk_tier, "hedging": hedge_budget.as_meta(), "tokens": account.as_meta()}
         )
 
     transcript = [current_answer]
     consensus_reached = False
     rounds_completed = 0
+    deadline_exceeded = False
+    budget_exhausted = False
+    stalled = None
+    convergence = ConvergenceDetector(current_answer)
 
-    for round_num in range(1, MAX_ROUNDS_DEFAULT+1):
+    for round_num in range(1, plan["max_rounds"]+1):
+        if remaining_time(deadline) <= 0:
+            deadline_exceeded = True
+            break
+        if account.exhausted():
+            budget_exhausted = True
+            break
         rounds_completed = round_num
-        critic_system = select_critic_variant()
-        critic_prompt = f"""
-{critic_system}
-
-Original query: {query}
-
-Proposed answer:
-{current_answer}
+        critiques = await critic_round(
+            select_critic_panel(plan["critic_panel_size"]), query, current_answer, deadline, account
+        )
+        transcript.extend(critiques)
 
-VERDICT: ACCEPT only if the answer is PERFECT — zero flaws, ambiguities, risks, or gaps.
-Otherwise VERDICT: REJECT followed by exhaustive destruction of every issue.
-"""
-        try:
-            critic_response = await acompletion(
-                model=CRITIC_MODEL,
-                messages=[{"role":"system","content":critic_prompt}],
-                max_tokens=400,
-                api_key=GROQ_API_KEY
-            )
-            critique = extract_content(critic_response)
-        except Exception:
-            critique = "CRITIC FAILURE - VERDICT: REJECT"
+        if all("VERDICT: ACCEPT" in c.upper() for c in critiques):
+            consensus_reached = True
+            break
 
-        transcript.append(critique)
+        if account.exhausted():
+            budget_exhausted = True
+            break
 
-        if "VERDICT: ACCEPT" in critique.upper():
-            consensus_reached = True
+        # No critic would see a defense written after the last round.
+        if round_num == plan["max_rounds"]:
             break
 
+        critique = "\n\n".join(critiques)
+
         defense_prompt = f"""
 Your previous answer was attacked by a hostile critic:
 
@@ -154,23 +228,43 @@ Address every point raised. Provide updated answer to the original query.
 """
         gen_messages.append({"role":"user","content":defense_prompt})
         try:
-            defense_response = await acompletion(
-                model=GENERATOR_MODEL,
-                messages=gen_messages,
-                max_tokens=500,
-                api_key=GROQ_API_KEY
+            defense_response = await asyncio.wait_for(
+                hedged_completion(gen_messages, max_tokens=500, budget=hedge_budget, account=account),
+                timeout=remaining_time(deadline)
             )
+            account.record("defense", defense_response)
             current_answer = extract_content(defense_response)
+            defended = True
         except Exception:
             current_answer = "DEFENSE FAILURE - previous answer stands"
+            defended = False
 
         gen_messages.append({"role":"assistant","content":current_answer})
         transcript.append(current_answer)
 
+        if defended:
+            stalled = await convergence.observe(critique, current_answer)
+            if stalled:
+                break
+
     transcript_hash = hashlib.sha256("\n".join(transcript).encode()).hexdigest()
-    record_verdict({"query": query, "answer": current_answer, "hash": transcript_hash})
+    if consensus_reached and account.exhausted():
+        budget_exhausted = True
+
+    granted = (
+        consensus_reached
+        and not budget_exhausted
+        and await quorum_vote(current_answer, query, risk_tier, plan, deadline, account)
+    )
+    record_verdict({
+        "query": query,
+        "risk_tier": risk_tier,
+        "answer": current_answer,
+        "hash": transcript_hash,
+        "tokens": account.as_meta()
+    })
 
-    if consensus_reached and await quorum_vote(current_answer, query, risk_tier):
+    if granted:
         scope = AuthorizationScope(
             context_hash=hashlib.sha256(query.encode()).hexdigest(),
             temporal_bounds=f"valid until {int(time.time())+2592000} (30 days)",
@@ -184,19 +278,40 @@ Address every point raised. Provide updated answer to the original query.
             scope=scope,
             refusal_diagnostics=None,
             certification_id=certification_id,
-            meta={"query": query, "rounds_completed": rounds_completed, "transcript_hash": transcript_hash}
+            meta={"query": query, "risk_tier": risk_tier, "rounds_completed": rounds_completed, "transcript_hash": transcript_hash, "hedging": hedge_budget.as_meta(), "tokens": account.as_meta()}
         )
 
-    diagnostics = RefusalDiagnostics(
-        failure_type="instability",
-        details=f"Failed to reach consensus after {rounds_completed} rounds.",
-        requirements_for_certification="Achieve perfect ACCEPT in all rounds and quorum consensus."
-    )
+    if budget_exhausted:
+        diagnostics = RefusalDiagnostics(
+            failure_type="budget_exhausted",
+            details=f"Token budget of {account.budget} exhausted after {rounds_completed} rounds ({account.total_tokens} tokens used).",
+            requirements_for_certification=(
+                "Resubmit with a larger 'token_budget' (requests without one are capped at "
+                "API_KEY_RESERVATION_TOKENS when a per-key budget is set) or at a lower risk tier."
+            )
+        )
+    elif stalled:
+        failure_type, reason = stalled
+        diagnostics = RefusalDiagnostics(
+            failure_type=failure_type,
+            details=f"Adversarial loop stalled at round {rounds_completed}: {reason}.",
+            requirements_for_certification="Provide additional evidence or narrow the query so the defense can change."
+        )
+    else:
+        if deadline_exceeded:
+            details = f"{risk_tier} deadline of {plan['deadline_sec']}s exceeded after {rounds_completed} rounds."
+        else:
+            details = f"Failed to reach consensus after {rounds_completed} rounds."
+        diagnostics = RefusalDiagnostics(
+            failure_type="instability",
+            details=details,
+            requirements_for_certification="Achieve perfect ACCEPT in all rounds and quorum consensus."
+        )
     return CETIResponse(
         authorization="DENIED",
         response_content="Authorization denied — output not safe for action.",
         scope=None,
         refusal_diagnostics=diagnostics,
         certification_id=None,
-        meta={"query": query, "rounds_completed": rounds_completed, "transcript_hash": transcript_hash}
+        meta={"query": query, "risk_tier": risk_tier, "rounds_completed": rounds_completed, "stalled_round": rounds_completed if stalled else None, "transcript_hash": transcript_hash, "hedging": hedge_budget.as_meta(), "tokens": account.as_meta()}
     )
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Ledger-driven traffic replay for capacity planning.
+
+Replays the query mix recorded in ledger.jsonl against a running /verify,
+either with the original inter-arrival timing (optionally compressed with
+--speedup) or at a fixed open-loop --rate. Latency is measured from each
+request's scheduled send time, so client-side queueing behind --concurrency
+is counted rather than hidden.
+
+With --simulate the app is driven in-process against a simulated oracle:
+no network, no provider keys, and ledger writes go to a temporary file.
+
+    python -m src.tools.replay --url http://localhost:8000 --api-key $CETI_MASTER_KEY --speedup 10
+    python -m src.tools.replay --simulate --rate 20 --limit 500
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+
+def load_workload(path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    workload = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            payload = record.get("payload") or {}
+            if not payload.get("query"):
+                continue
+            workload.append({
+                "timestamp": record.get("timestamp", 0),
+                "query": payload["query"],
+                "risk_tier": payload.get("risk_tier", "MEDIUM"),
+            })
+    workload.sort(key=lambda r: r["timestamp"])
+    return workload[:limit] if limit else workload
+
+
+def schedule(
+    workload: List[Dict[str, Any]],
+    speedup: float = 1.0,
+    rate: Optional[float] = None,
+    poisson: bool = False,
+    max_gap: Optional[float] = None
+) -> List[float]:
+    if speedup <= 0:
+        raise ValueError("speedup must be positive")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be positive")
+    offsets = []
+    t = 0.0
+    for i, record in enumerate(workload):
+        if i > 0:
+            if rate is not None:
+                gap = random.expovariate(rate) if poisson else 1.0 / rate
+            else:
+                gap = (record["timestamp"] - workload[i - 1]["timestamp"]) / speedup
+            if max_gap is not None:
+                gap = min(gap, max_gap)
+            t += max(0.0, gap)
+        offsets.append(t)
+    return offsets
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def summarize(results: List[Dict[str, Any]], wall_sec: float, workload: List[Dict[str, Any]]) -> Dict[str, Any]:
+    tiers: Dict[str, Dict[str, Any]] = {}
+    for tier in sorted({r["risk_tier"] for r in results}) + ["ALL"]:
+        rows = [r for r in results if tier == "ALL" or r["risk_tier"] == tier]
+        ok = [r for r in rows if r["status"] == 200]
+        latencies = [r["latency"] for r in ok]
+        tiers[tier] = {
+            "requests": len(rows),
+            "completed": len(ok),
+            "throughput_rps": len(ok) / wall_sec if wall_sec else 0.0,
+            "error_rate": (len(rows) - len(ok)) / len(rows) if rows else 0.0,
+            "shed": sum(1 for r in rows if r["status"] == 503),
+            "granted": sum(1 for r in ok if r["authorization"] == "GRANTED"),
+            "p50_sec": percentile(latencies, 0.50),
+            "p90_sec": percentile(latencies, 0.90),
+            "p99_sec": percentile(latencies, 0.99),
+            "max_sec": max(latencies) if latencies else None,
+        }
+    queries = [r["query"] for r in workload]
+    return {
+        "wall_sec": wall_sec,
+        "repeat_rate": 1 - len(set(queries)) / len(queries) if queries else 0.0,
+        "tiers": tiers,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    def fmt(v):
+        return "-" if v is None else f"{v:.3f}"
+
+    print(f"wall time {report['wall_sec']:.1f}s, workload repeat rate {report['repeat_rate']:.1%}")
+    print(f"{'tier':<9}{'reqs':>7}{'ok':>7}{'rps':>9}{'err%':>8}{'shed':>6}{'grant':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for tier, s in report["tiers"].items():
+        print(
+            f"{tier:<9}{s['requests']:>7}{s['completed']:>7}{s['throughput_rps']:>9.2f}"
+            f"{s['error_rate'] * 100:>7.1f}%{s['shed']:>6}{s['granted']:>7}"
+            f"{fmt(s['p50_sec']):>9}{fmt(s['p90_sec']):>9}{fmt(s['p99_sec']):>9}{fmt(s['max_sec']):>9}"
+        )
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    api_key: str,
+    workload: List[Dict[str, Any]],
+    offsets: List[float],
+    concurrency: int,
+    timeout: float
+) -> List[Dict[str, Any]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.monotonic()
+
+    async def fire(record: Dict[str, Any], offset: float) -> Dict[str, Any]:
+        await asyncio.sleep(max(0.0, start + offset - time.monotonic()))
+        scheduled = start + offset
+        result = {"risk_tier": record["risk_tier"], "status": 0, "authorization": None}
+        async with semaphore:
+            try:
+                res = await client.post(
+                    "/verify",
+                    json={"query": record["query"], "risk_tier": record["risk_tier"]},
+                    headers={"Authorization": f"Bearer {api_key}"},
+                    timeout=timeout
+                )
+                result["status"] = res.status_code
+                if res.status_code == 200:
+                    result["authorization"] = res.json().get("authorization")
+            except Exception as e:
+                result["error"] = str(e)
+        result["latency"] = time.monotonic() - scheduled
+        return result
+
+    return await asyncio.gather(*(fire(r, o) for r, o in zip(workload, offsets)))
+
+
+def install_simulated_oracle(latency: float, accept_rate: float) -> None:
+    """Replace provider calls with a local oracle that answers after a lognormal delay."""
+    from src.engine import hedging, verification_with_ledger
+    from src.ledger import vault
+
+    async def acompletion(model, messages, max_tokens, **kwargs):
+        await asyncio.sleep(random.lognormvariate(0, 0.5) * latency)
+        if messages[-1]["role"] == "system":
+            verdict = "ACCEPT" if random.random() < accept_rate else "REJECT"
+            content = f"VERDICT: {verdict}"
+        else:
+            content = f"Simulated answer {random.randint(0, 1_000_000)} from {model}."
+        prompt_tokens = sum(len(m["content"].split()) for m in messages)
+        completion_tokens = random.randint(max_tokens // 4, max_tokens)
+        return {
+            "choices": [{"message": {"content": content}}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    hedging.acompletion = acompletion
+    verification_with_ledger.acompletion = acompletion
+    verification_with_ledger.browse_web = lambda query, num_results=5: "Simulated web context."
+    vault.LEDGER_PATH = os.path.join(tempfile.mkdtemp(prefix="ceti-replay-"), "ledger.jsonl")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    workload = load_workload(args.ledger, args.limit)
+    if not workload:
+        raise SystemExit(f"No replayable records in {args.ledger}")
+    offsets = schedule(workload, args.speedup, args.rate, args.poisson, args.max_gap)
+
+    if args.simulate:
+        for key in ("SERPER_API_KEY", "GROQ_API_KEY", "DEEPSEEK_API_KEY"):
+            os.environ.setdefault(key, "simulated")
+        os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+        os.environ["CONVERGENCE_USE_EMBEDDINGS"] = "false"
+        # Importing the app runs enforce_invariants(), which prints to stdout;
+        # keep stdout clean for the report.
+        with contextlib.redirect_stdout(sys.stderr):
+            install_simulated_oracle(args.sim_latency, args.sim_accept_rate)
+            from main import app, API_MASTER_KEY
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://ceti.local")
+        api_key = API_MASTER_KEY
+    else:
+        client = httpx.AsyncClient(
+            base_url=args.url,
+            limits=httpx.Limits(max_connections=args.concurrency)
+        )
+        api_key = args.api_key
+
+    async with client:
+        start = time.monotonic()
+        results = await replay(client, api_key, workload, offsets, args.concurrency, args.timeout)
+        wall_sec = time.monotonic() - start
+    return summarize(results, wall_sec, workload)
+
+
+def positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return number
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay ledger traffic against /verify")
+    parser.add_argument("--ledger", default=os.getenv("CETI_LEDGER_PATH", "./ledger.jsonl"))
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--api-key", default=os.getenv("CETI_MASTER_KEY", "default-master-key"))
+    parser.add_argument("--limit", type=positive_int, help="Replay only the first N records")
+    parser.add_argument("--speedup", type=positive_float, default=1.0, help="Compress original inter-arrival gaps by this factor")
+    parser.add_argument("--max-gap", type=positive_float, help="Cap any single inter-arrival gap (seconds)")
+    parser.add_argument("--rate", type=positive_float, help="Fixed open-loop arrival rate (req/s) instead of recorded timing")
+    parser.add_argument("--poisson", action="store_true", help="Exponential inter-arrivals at --rate")
+    parser.add_argument("--concurrency", type=positive_int, default=64, help="Maximum in-flight requests")
+    parser.add_argument("--timeout", type=positive_float, default=300.0, help="Per-request client timeout (seconds)")
+    parser.add_argument("--simulate", action="store_true", help="Drive main:app in-process against a simulated oracle")
+    parser.add_argument("--sim-latency", type=positive_float, default=0.5, help="Median simulated oracle latency (seconds)")
+    parser.add_argument("--sim-accept-rate", type=float, default=0.7, help="Probability a simulated critic/judge accepts")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """Embedding helpers — for ledger semantic search (Invariant 6 mechanical seed)."""
 
+from typing import List
+
 from sentence_transformers import SentenceTransformer
 
 # Singleton embedding model
@@ -0,0 +1,7 @@
+import os
+
+os.environ.setdefault("SERPER_API_KEY", "test-serper")
+os.environ.setdefault("GROQ_API_KEY", "test-groq")
+os.environ.setdefault("DEEPSEEK_API_KEY", "test-deepseek")
+os.environ.setdefault("CONVERGENCE_USE_EMBEDDINGS", "false")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
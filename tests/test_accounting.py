@@ -0,0 +1,68 @@
+import asyncio
+
+from src.config.settings import GENERATOR_MODEL, GENERATOR_FALLBACK_MODEL
+from src.engine import accounting, hedging
+from src.engine.accounting import KeyBudgets, TokenAccount, usage_of
+
+
+def test_usage_of_dict_and_object_responses():
+    class Usage:
+        prompt_tokens = 10
+        completion_tokens = 5
+        total_tokens = 15
+
+    class Response:
+        usage = Usage()
+
+    assert usage_of(Response())["total_tokens"] == 15
+    assert usage_of({"usage": {"prompt_tokens": 3, "completion_tokens": 2}})["total_tokens"] == 5
+    assert usage_of({})["total_tokens"] == 0
+
+
+def test_account_exhaustion():
+    account = TokenAccount(budget=20)
+    account.add("generator", 10, 5)
+    assert not account.exhausted()
+    account.add("critic", 3, 2)
+    assert account.exhausted()
+    assert account.as_meta()["by_stage"] == {"generator": 15, "critic": 5}
+
+
+def test_concurrent_reservations_cannot_exceed_key_budget(monkeypatch):
+    monkeypatch.setattr(accounting, "API_KEY_RESERVATION_TOKENS", 400)
+    budgets = KeyBudgets(limit=1000, window_sec=3600)
+    reservations = [budgets.reserve("key") for _ in range(4)]
+    assert [r.budget for r in reservations] == [400, 400, 200, 0]
+    assert sum(r.budget for r in reservations) <= 1000
+
+
+def test_explicit_budget_is_not_capped_by_default_reservation():
+    budgets = KeyBudgets(limit=10_000_000, window_sec=3600)
+    assert budgets.reserve("key", requested=100_000).budget == 100_000
+    assert budgets.reserve("key").budget == accounting.API_KEY_RESERVATION_TOKENS
+    assert KeyBudgets(limit=1000, window_sec=3600).reserve("key", requested=100_000).budget == 1000
+
+
+def test_settle_refunds_unused_reservation():
+    budgets = KeyBudgets(limit=1000, window_sec=3600)
+    reservation = budgets.reserve("key", requested=600)
+    assert budgets.remaining("key") == 400
+    reservation.settle(100)
+    assert budgets.remaining("key") == 900
+
+
+async def test_cancelled_hedge_call_is_charged(monkeypatch):
+    async def acompletion(model, messages, max_tokens, **kwargs):
+        await asyncio.sleep(0.5 if model == GENERATOR_MODEL else 0.01)
+        return {
+            "choices": [{"message": {"content": model}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+        }
+
+    monkeypatch.setattr(hedging, "acompletion", acompletion)
+    monkeypatch.setattr(hedging, "GENERATOR_LATENCY", hedging.LatencyTracker())
+    monkeypatch.setattr(hedging, "HEDGE_DEFAULT_DELAY_SEC", 0.02)
+    account = TokenAccount()
+    response = await hedging.hedged_completion([{"role": "user", "content": "x" * 400}], 50, account=account)
+    assert response["choices"][0]["message"]["content"] == GENERATOR_FALLBACK_MODEL
+    assert account.by_stage["generator:cancelled"] == 100 + 50
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+
+from src.config.settings import get_tier_plan
+from src.engine.admission import AdmissionController, AdmissionRejected
+
+
+async def run(controller, outcomes, name, tier, hold=0.05):
+    try:
+        async with controller.slot(tier):
+            outcomes.append(name)
+            await asyncio.sleep(hold)
+    except AdmissionRejected:
+        outcomes.append(f"shed:{name}")
+
+
+async def test_queue_serves_higher_tiers_first():
+    controller = AdmissionController(max_concurrency=1, min_concurrency=1, max_queue=8)
+    outcomes = []
+    tasks = [asyncio.create_task(run(controller, outcomes, "first", "LOW"))]
+    await asyncio.sleep(0)
+    for name, tier in [("low", "LOW"), ("medium", "MEDIUM"), ("critical", "CRITICAL")]:
+        tasks.append(asyncio.create_task(run(controller, outcomes, name, tier)))
+    await asyncio.gather(*tasks)
+    assert outcomes == ["first", "critical", "medium", "low"]
+
+
+async def test_full_queue_sheds_low_tier_first():
+    controller = AdmissionController(max_concurrency=1, min_concurrency=1, max_queue=2)
+    outcomes = []
+    tasks = [asyncio.create_task(run(controller, outcomes, "running", "MEDIUM"))]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(run(controller, outcomes, f"low{i}", "LOW")) for i in range(2)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(run(controller, outcomes, "critical", "CRITICAL")))
+    tasks.append(asyncio.create_task(run(controller, outcomes, "late-low", "LOW")))
+    await asyncio.gather(*tasks)
+    assert "shed:low1" in outcomes
+    assert "shed:late-low" in outcomes
+    assert outcomes.index("critical") < outcomes.index("low0")
+    assert controller.stats()["shed"] == 2
+
+
+async def test_rejection_carries_retry_after():
+    controller = AdmissionController(max_concurrency=1, min_concurrency=1, max_queue=0)
+    async with controller.slot("LOW"):
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await controller.acquire("LOW")
+    assert excinfo.value.retry_after >= 1
+
+
+async def test_queue_time_counts_against_deadline():
+    controller = AdmissionController(max_concurrency=1, min_concurrency=1, max_queue=4)
+    arrival = time.monotonic()
+    holder = asyncio.create_task(run(controller, [], "holder", "LOW", hold=0.1))
+    await asyncio.sleep(0)
+    async with controller.slot("LOW") as deadline:
+        assert deadline == pytest.approx(arrival + get_tier_plan("LOW")["deadline_sec"], abs=0.05)
+    await holder
+
+
+async def test_long_runs_do_not_shrink_limit_without_oracle_slowdown():
+    controller = AdmissionController(max_concurrency=8, min_concurrency=2, max_queue=4)
+    for _ in range(20):
+        controller.observe_oracle_latency(0.5)
+    for _ in range(20):
+        await controller.acquire("CRITICAL")
+        controller.release(get_tier_plan("CRITICAL")["deadline_sec"], completed=True)
+    assert controller.limit == 8
+
+
+async def test_oracle_slowdown_shrinks_limit():
+    controller = AdmissionController(max_concurrency=8, min_concurrency=2, max_queue=4)
+    for _ in range(20):
+        controller.observe_oracle_latency(0.5)
+    for _ in range(10):
+        controller.observe_oracle_latency(5.0)
+    await controller.acquire("LOW")
+    controller.release(1.0, completed=True)
+    assert controller.limit < 8
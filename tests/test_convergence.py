@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from src.engine import convergence
+from src.engine.convergence import ConvergenceDetector, lexical_similarity
+
+
+def test_lexical_similarity():
+    assert lexical_similarity("the cat sat on the mat", "the cat sat on the mat") == 1.0
+    assert lexical_similarity("the cat sat", "quantum field theory") == 0.0
+
+
+async def test_repeated_defense_and_critique_is_contradiction():
+    detector = ConvergenceDetector("Paris is the capital of France.")
+    answer = "Paris is the capital of France, per official sources."
+    critique = "VERDICT: REJECT no primary source cited"
+    assert await detector.observe(critique, answer) is None
+    failure_type, _ = await detector.observe(critique, answer)
+    assert failure_type == "contradiction"
+
+
+async def test_flip_flopping_defense_is_instability():
+    detector = ConvergenceDetector("initial")
+    assert await detector.observe("c one", "the answer is alpha beta gamma delta") is None
+    assert await detector.observe("c two", "entirely different content about zeta eta") is None
+    failure_type, _ = await detector.observe("c three", "the answer is alpha beta gamma delta")
+    assert failure_type == "instability"
+
+
+async def test_changing_defense_keeps_looping():
+    detector = ConvergenceDetector("a b c")
+    for i in range(4):
+        assert await detector.observe(f"critique {i} point {i}", f"revision {i} adds point {i} and evidence {i}") is None
+
+
+async def test_embeddings_load_off_loop_and_are_cached(monkeypatch):
+    loop_thread = threading.get_ident()
+    load_threads, embedded = [], []
+
+    class FakeModule:
+        @staticmethod
+        def get_embedding(text):
+            embedded.append(text)
+            return [1.0, float(len(text))]
+
+    def import_module(name):
+        load_threads.append(threading.get_ident())
+        return FakeModule
+
+    monkeypatch.setattr(convergence, "_embed", None)
+    monkeypatch.setattr(convergence, "_embeddings_available", True)
+    monkeypatch.setattr(convergence.importlib, "import_module", import_module)
+
+    detector = ConvergenceDetector("first")
+    await asyncio.gather(detector.observe("crit", "second"), asyncio.sleep(0))
+    await detector.observe("crit", "third")
+    await detector.observe("crit", "fourth")
+    assert load_threads and loop_thread not in load_threads
+    assert len(load_threads) == 1
+    assert len(embedded) == len(set(embedded))
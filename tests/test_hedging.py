@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.config.settings import GENERATOR_MODEL, GENERATOR_FALLBACK_MODEL
+from src.engine import hedging
+
+
+@pytest.fixture
+def oracle(monkeypatch):
+    behaviour = {}
+
+    async def acompletion(model, messages, max_tokens, **kwargs):
+        delay, fail = behaviour[model]
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{model} failed")
+        return {"choices": [{"message": {"content": model}}]}
+
+    monkeypatch.setattr(hedging, "acompletion", acompletion)
+    monkeypatch.setattr(hedging, "GENERATOR_LATENCY", hedging.LatencyTracker())
+    monkeypatch.setattr(hedging, "HEDGE_TOTALS", dict.fromkeys(hedging.HEDGE_TOTALS, 0))
+    monkeypatch.setattr(hedging, "HEDGE_DEFAULT_DELAY_SEC", 0.02)
+    return behaviour
+
+
+def content(response):
+    return response["choices"][0]["message"]["content"]
+
+
+async def test_fast_primary_is_not_hedged(oracle):
+    oracle.update({GENERATOR_MODEL: (0.0, False), GENERATOR_FALLBACK_MODEL: (0.0, False)})
+    budget = hedging.HedgeBudget()
+    assert content(await hedging.hedged_completion([], 10, budget)) == GENERATOR_MODEL
+    assert budget.as_meta() == {"generator_calls": 1, "hedges": 0, "hedge_wins": 0, "failovers": 0}
+
+
+async def test_slow_primary_is_hedged_and_backup_wins(oracle):
+    oracle.update({GENERATOR_MODEL: (0.5, False), GENERATOR_FALLBACK_MODEL: (0.01, False)})
+    budget = hedging.HedgeBudget()
+    assert content(await hedging.hedged_completion([], 10, budget)) == GENERATOR_FALLBACK_MODEL
+    assert budget.hedges == 1 and budget.hedge_wins == 1
+
+
+async def test_primary_error_fails_over(oracle):
+    oracle.update({GENERATOR_MODEL: (0.0, True), GENERATOR_FALLBACK_MODEL: (0.0, False)})
+    budget = hedging.HedgeBudget()
+    assert content(await hedging.hedged_completion([], 10, budget)) == GENERATOR_FALLBACK_MODEL
+    assert budget.failovers == 1 and budget.hedges == 0
+
+
+async def test_exhausted_budget_surfaces_primary_error(oracle):
+    oracle.update({GENERATOR_MODEL: (0.0, True), GENERATOR_FALLBACK_MODEL: (0.0, False)})
+    with pytest.raises(RuntimeError):
+        await hedging.hedged_completion([], 10, hedging.HedgeBudget(limit=0))
+
+
+async def test_hedge_delay_follows_slowing_primary(oracle, monkeypatch):
+    monkeypatch.setattr(hedging, "HEDGE_MIN_SAMPLES", 5)
+    oracle.update({GENERATOR_MODEL: (0.005, False), GENERATOR_FALLBACK_MODEL: (0.03, False)})
+    for _ in range(10):
+        await hedging.hedged_completion([], 10, hedging.HedgeBudget())
+    fast_delay = hedging.GENERATOR_LATENCY.percentile()
+
+    oracle[GENERATOR_MODEL] = (0.06, False)
+    for _ in range(30):
+        await hedging.hedged_completion([], 10, hedging.HedgeBudget())
+    assert hedging.GENERATOR_LATENCY.percentile() > fast_delay
+
+
+async def test_backup_uses_fallback_provider_key(oracle, monkeypatch):
+    keys = []
+
+    async def acompletion(model, messages, max_tokens, api_key=None):
+        keys.append((model, api_key))
+        if model == "groq/primary":
+            raise RuntimeError("primary down")
+        return {"choices": [{"message": {"content": model}}]}
+
+    monkeypatch.setattr(hedging, "acompletion", acompletion)
+    monkeypatch.setattr(hedging, "GENERATOR_MODEL", "groq/primary")
+    monkeypatch.setattr(hedging, "GENERATOR_FALLBACK_MODEL", "groq/backup")
+    await hedging.hedged_completion([], 10, hedging.HedgeBudget())
+    assert keys[-1] == ("groq/backup", hedging.GROQ_API_KEY)
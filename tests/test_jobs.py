@@ -0,0 +1,102 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.engine import jobs
+
+
+class FakeResult:
+    def __init__(self, query):
+        self.query = query
+        self.meta = {"tokens": {"total_tokens": 0}}
+
+    def model_dump(self):
+        return {"authorization": "DENIED", "query": self.query}
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    calls = []
+
+    async def verify_query_with_ledger(query, risk_tier, **kwargs):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return FakeResult(query)
+
+    monkeypatch.setattr(jobs, "verify_query_with_ledger", verify_query_with_ledger)
+    return calls
+
+
+async def test_jobs_run_and_long_poll(engine, tmp_path):
+    manager = jobs.JobManager(jobs.JobStore(str(tmp_path / "jobs.jsonl")), workers=2)
+    await manager.start()
+    job = await manager.submit("q1", "LOW")
+    done = await manager.wait(job["id"], timeout=2)
+    await manager.stop()
+    assert done["status"] == "done"
+    assert done["result"]["query"] == "q1"
+
+
+async def test_pending_jobs_survive_restart(engine, tmp_path):
+    path = str(tmp_path / "jobs.jsonl")
+    first = jobs.JobManager(jobs.JobStore(path), workers=1)
+    job = await first.submit("interrupted", "HIGH")
+    assert engine == []
+
+    second = jobs.JobManager(jobs.JobStore(path), workers=1)
+    await second.start()
+    done = await second.wait(job["id"], timeout=2)
+    await second.stop()
+    assert done["status"] == "done"
+    assert engine == ["interrupted"]
+
+
+async def test_expired_jobs_are_evicted_and_journal_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_SWEEP_INTERVAL_SEC", 0)
+    store = jobs.JobStore(str(tmp_path / "jobs.jsonl"), retention_sec=-1, compact_bytes=2000)
+    for i in range(50):
+        job = {"id": f"job{i}", "status": "queued", "created_at": 0, "result": None}
+        await store.save(job)
+        job["status"] = "done"
+        job["result"] = {"payload": "x" * 50}
+        await store.save(job)
+
+    assert len(store.jobs) <= 1
+    with open(store.path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) < 100
+    assert store.journal_bytes < 2 * 2000
+
+
+async def test_compaction_runs_off_the_event_loop(tmp_path):
+    store = jobs.JobStore(str(tmp_path / "jobs.jsonl"), compact_bytes=1)
+    rewrite = store._rewrite
+    store._rewrite = lambda snapshot: time.sleep(0.2) or rewrite(snapshot)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(
+        store.save({"id": "a", "status": "queued", "created_at": 0}),
+        store.save({"id": "b", "status": "queued", "created_at": 0}),
+    )
+    task.cancel()
+    assert ticks >= 10
+    with open(store.path, encoding="utf-8") as f:
+        assert {json.loads(line)["id"] for line in f} == {"a", "b"}
+
+
+async def test_full_queue_reports_retry_after(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_QUEUE_MAX", 1)
+    manager = jobs.JobManager(jobs.JobStore(str(tmp_path / "jobs.jsonl")), workers=1)
+    await manager.submit("q1", "LOW")
+    with pytest.raises(jobs.JobQueueFull) as excinfo:
+        await manager.submit("q2", "LOW")
+    assert excinfo.value.retry_after >= 1
@@ -0,0 +1,65 @@
+import argparse
+import json
+
+import pytest
+
+from src.tools import replay
+
+
+def write_ledger(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.write("not json\n")
+
+
+def test_load_workload_orders_by_timestamp_and_skips_bad_lines(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    write_ledger(path, [
+        {"timestamp": 20, "payload": {"query": "b", "risk_tier": "HIGH"}},
+        {"timestamp": 10, "payload": {"query": "a"}},
+        {"timestamp": 15, "payload": {}},
+    ])
+    workload = replay.load_workload(str(path))
+    assert [r["query"] for r in workload] == ["a", "b"]
+    assert workload[0]["risk_tier"] == "MEDIUM"
+    assert len(replay.load_workload(str(path), limit=1)) == 1
+
+
+def test_schedule_speedup_rate_and_max_gap():
+    workload = [{"timestamp": t} for t in (0, 10, 30)]
+    assert replay.schedule(workload) == [0.0, 10.0, 30.0]
+    assert replay.schedule(workload, speedup=10) == [0.0, 1.0, 3.0]
+    assert replay.schedule(workload, max_gap=5) == [0.0, 5.0, 10.0]
+    assert replay.schedule(workload, rate=2) == [0.0, 0.5, 1.0]
+
+
+@pytest.mark.parametrize("kwargs", [{"speedup": 0}, {"rate": 0}, {"speedup": -1}])
+def test_schedule_rejects_non_positive_rates(kwargs):
+    with pytest.raises(ValueError):
+        replay.schedule([{"timestamp": 0}, {"timestamp": 1}], **kwargs)
+
+
+def test_cli_rejects_zero_speedup_and_rate(monkeypatch, capsys):
+    for flag in ("--speedup", "--rate", "--concurrency"):
+        monkeypatch.setattr("sys.argv", ["replay", flag, "0"])
+        with pytest.raises(SystemExit):
+            replay.main()
+        assert "must be positive" in capsys.readouterr().err
+    with pytest.raises(argparse.ArgumentTypeError):
+        replay.positive_float("0")
+
+
+def test_summarize_counts_per_tier():
+    results = [
+        {"risk_tier": "LOW", "status": 200, "authorization": "GRANTED", "latency": 1.0},
+        {"risk_tier": "LOW", "status": 503, "authorization": None, "latency": 0.1},
+        {"risk_tier": "HIGH", "status": 200, "authorization": "DENIED", "latency": 2.0},
+    ]
+    workload = [{"query": "a"}, {"query": "a"}, {"query": "b"}]
+    report = replay.summarize(results, 2.0, workload)
+    assert report["tiers"]["LOW"]["shed"] == 1
+    assert report["tiers"]["LOW"]["error_rate"] == 0.5
+    assert report["tiers"]["ALL"]["completed"] == 2
+    assert report["tiers"]["ALL"]["granted"] == 1
+    assert report["repeat_rate"] == pytest.approx(1 / 3)
@@ -0,0 +1,56 @@
+import pytest
+
+from src.config import settings
+from src.config.settings import RISK_TIER_PLANS, enforce_tier_plan_invariants, required_accepts
+
+
+def test_high_and_critical_keep_strict_two_thirds_quorum():
+    for tier in ("HIGH", "CRITICAL"):
+        plan = RISK_TIER_PLANS[tier]
+        assert len(plan["judge_models"]) == 3
+        assert required_accepts(plan) == 3
+
+
+def test_low_and_medium_are_cheaper():
+    assert RISK_TIER_PLANS["LOW"]["max_rounds"] < RISK_TIER_PLANS["CRITICAL"]["max_rounds"]
+    assert len(RISK_TIER_PLANS["LOW"]["judge_models"]) >= 2
+    assert required_accepts(RISK_TIER_PLANS["LOW"]) >= 2
+    assert required_accepts(RISK_TIER_PLANS["MEDIUM"]) == 2
+
+
+def test_quorum_threshold_must_exceed_two_thirds(monkeypatch):
+    plans = {tier: dict(plan) for tier, plan in RISK_TIER_PLANS.items()}
+    plans["CRITICAL"]["quorum_threshold"] = 0.5
+    monkeypatch.setattr(settings, "RISK_TIER_PLANS", plans)
+    with pytest.raises(AssertionError):
+        enforce_tier_plan_invariants()
+
+
+def test_higher_tier_cannot_loosen_quorum(monkeypatch):
+    plans = {tier: dict(plan) for tier, plan in RISK_TIER_PLANS.items()}
+    plans["MEDIUM"]["quorum_threshold"] = 0.9
+    monkeypatch.setattr(settings, "RISK_TIER_PLANS", plans)
+    with pytest.raises(AssertionError):
+        enforce_tier_plan_invariants()
+
+
+async def test_high_quorum_rejects_two_of_three(monkeypatch):
+    from src.engine import verification_with_ledger as engine
+
+    async def acompletion(model, messages, max_tokens, **kwargs):
+        verdict = "REJECT" if model == RISK_TIER_PLANS["HIGH"]["judge_models"][-1] else "ACCEPT"
+        return {"choices": [{"message": {"content": f"VERDICT: {verdict}"}}]}
+
+    monkeypatch.setattr(engine, "acompletion", acompletion)
+    account = engine.TokenAccount()
+    deadline = engine.time.monotonic() + 5
+    assert not await engine.quorum_vote("answer", "query", "HIGH", RISK_TIER_PLANS["HIGH"], deadline, account)
+    assert await engine.quorum_vote("answer", "query", "MEDIUM", RISK_TIER_PLANS["MEDIUM"], deadline, account)
+
+
+def test_single_judge_tier_is_rejected(monkeypatch):
+    plans = {tier: dict(plan) for tier, plan in RISK_TIER_PLANS.items()}
+    plans["LOW"]["judge_models"] = plans["LOW"]["judge_models"][:1]
+    monkeypatch.setattr(settings, "RISK_TIER_PLANS", plans)
+    with pytest.raises(AssertionError):
+        enforce_tier_plan_invariants()
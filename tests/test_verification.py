@@ -0,0 +1,60 @@
+import time
+
+from src.config import settings
+from src.engine import hedging
+from src.engine import verification_with_ledger as engine
+from src.ledger import vault
+
+
+def install_oracle(monkeypatch, tmp_path, critic_verdict="ACCEPT"):
+    async def acompletion(model, messages, max_tokens, **kwargs):
+        if messages[-1]["role"] == "system":
+            content = f"VERDICT: {critic_verdict}"
+        else:
+            content = f"answer {len(messages)}"
+        return {
+            "choices": [{"message": {"content": content}}],
+            "usage": {"prompt_tokens": 40, "completion_tokens": 60, "total_tokens": 100},
+        }
+
+    monkeypatch.setattr(engine, "acompletion", acompletion)
+    monkeypatch.setattr(hedging, "acompletion", acompletion)
+    monkeypatch.setattr(vault, "LEDGER_PATH", str(tmp_path / "ledger.jsonl"))
+
+
+async def test_slow_web_search_is_bounded_by_tier_deadline(monkeypatch, tmp_path):
+    install_oracle(monkeypatch, tmp_path)
+    monkeypatch.setattr(engine, "browse_web", lambda query, num_results=5: time.sleep(0.5) or "late")
+    plans = dict(settings.RISK_TIER_PLANS, LOW=dict(settings.RISK_TIER_PLANS["LOW"], deadline_sec=0.1))
+    monkeypatch.setattr(settings, "RISK_TIER_PLANS", plans)
+    started = time.monotonic()
+    result = await engine.verify_query_with_ledger("What is 2+2?", "LOW")
+    assert time.monotonic() - started < 0.45
+    assert result.authorization == "DENIED"
+
+
+async def test_caller_deadline_overrides_tier_clock(monkeypatch, tmp_path):
+    install_oracle(monkeypatch, tmp_path)
+    monkeypatch.setattr(engine, "browse_web", lambda query, num_results=5: "context")
+    result = await engine.verify_query_with_ledger("What is 2+2?", "CRITICAL", deadline=time.monotonic() - 1)
+    assert result.authorization == "DENIED"
+    assert result.refusal_diagnostics.failure_type == "instability"
+
+
+async def test_budget_exhaustion_stops_loop(monkeypatch, tmp_path):
+    install_oracle(monkeypatch, tmp_path, critic_verdict="REJECT")
+    monkeypatch.setattr(engine, "browse_web", lambda query, num_results=5: "context")
+    result = await engine.verify_query_with_ledger("What is 2+2?", "CRITICAL", token_budget=250)
+    assert result.authorization == "DENIED"
+    assert result.refusal_diagnostics.failure_type == "budget_exhausted"
+    assert result.meta["rounds_completed"] < settings.RISK_TIER_PLANS["CRITICAL"]["max_rounds"]
+    assert result.meta["tokens"]["total_tokens"] >= 250
+
+
+async def test_last_round_rejection_skips_unreviewed_defense(monkeypatch, tmp_path):
+    install_oracle(monkeypatch, tmp_path, critic_verdict="REJECT")
+    monkeypatch.setattr(engine, "browse_web", lambda query, num_results=5: "context")
+    result = await engine.verify_query_with_ledger("What is 2+2?", "LOW")
+    assert result.authorization == "DENIED"
+    assert "defense" not in result.meta["tokens"]["by_stage"]
+    assert result.meta["tokens"]["oracle_calls"] == 1 + settings.RISK_TIER_PLANS["LOW"]["critic_panel_size"]